@@ -1,10 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from spatium.api import device, deployment
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close pooled device connections on shutdown
+    await device.sonic_client.close()
+
+
 app = FastAPI(
     title="Spatium",
     description="Network Configuration Analyzer and Digital Twin Platform",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Include routers from API modules
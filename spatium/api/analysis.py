@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from spatium.models.device import DeviceCredentials, ConfigAnalysisRequest
-from spatium.device_config.sonic_client import SonicClient
+from spatium.api import device
 from spatium.analysis.batfish_analyzer import analyze_config_with_batfish
 from typing import Dict, Any
 
@@ -10,7 +10,9 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-sonic_client = SonicClient()
+# Share the device router's client, so both use one connection pool, closed
+# on shutdown, and one result cache
+sonic_client = device.sonic_client
 
 
 @router.post("/config")
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from spatium.models.deployment import TopologyConfig, DeploymentResponse
 from spatium.deployment.containerlab import ContainerLabDeployer
+from spatium.core.config import settings
 from typing import Dict, Any
 
 router = APIRouter(
@@ -9,19 +12,67 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-deployer = ContainerLabDeployer()
+deployer = ContainerLabDeployer(command_timeout=settings.CONTAINERLAB_TIMEOUT)
 
 
-@router.post("/deploy", response_model=DeploymentResponse)
-async def deploy_topology(config: TopologyConfig) -> Dict[str, Any]:
+def _inline_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve local $defs references so the schema can be embedded in OpenAPI.
+    """
+    defs = schema.pop("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
+
+    return resolve(schema)
+
+
+@router.post(
+    "/deploy",
+    response_model=DeploymentResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": _inline_schema(TopologyConfig.model_json_schema())
+                }
+            },
+            "required": True,
+        }
+    },
+)
+async def deploy_topology(request: Request) -> Dict[str, Any]:
     """
     Deploy a network topology using ContainerLab.
+
+    The request body is validated straight from the raw bytes so that
+    pydantic-core parses the JSON in a single pass.
     """
     try:
+        config = TopologyConfig.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                # The input may be raw request bytes, which are not always
+                # valid UTF-8 and could not be rendered in the response
+                for error in e.errors(include_url=False, include_input=False)
+            ]
+        )
+
+    try:
+        # The models are already validated, so their field dicts can be read
+        # directly instead of serializing each one again with model_dump().
         topology = deployer.create_sonic_topology(
             name=config.name,
-            nodes=[node.model_dump() for node in config.nodes],
-            links=[link.model_dump() for link in config.links],
+            nodes=[node.__dict__ for node in config.nodes],
+            links=[link.__dict__ for link in config.links],
             mgmt_network=config.mgmt_network,
         )
         result = await deployer.deploy_topology(topology)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from spatium.models.device import DeviceCredentials
 from spatium.device_config.sonic_client import SonicClient
+from spatium.core.config import settings
 from typing import Dict, Any
 
 router = APIRouter(
@@ -9,7 +10,7 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-sonic_client = SonicClient()
+sonic_client = SonicClient(cache_ttl=settings.DEVICE_CONFIG_CACHE_TTL)
 
 
 @router.post("/config")
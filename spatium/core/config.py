@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Optional
 import os
 
 
@@ -15,10 +16,28 @@ class Settings(BaseSettings):
     BATFISH_HOST: str = os.getenv("BATFISH_HOST", "localhost")
     BATFISH_PORT: int = int(os.getenv("BATFISH_PORT", "9997"))
 
+    # ContainerLab settings
+    CONTAINERLAB_TIMEOUT: Optional[float] = None
+
     # Default credentials (for development only)
     DEFAULT_SSH_PORT: int = 22
     DEFAULT_GNMI_PORT: int = 8080
 
+    # Seconds to wait when connecting to a device (None: library default)
+    SSH_CONNECT_TIMEOUT: Optional[float] = 10.0
+    GNMI_TIMEOUT: int = 5
+
+    # SSH connection pool settings
+    SSH_POOL_MAX_SIZE: int = 64
+    SSH_POOL_IDLE_TIMEOUT: float = 300.0
+    SSH_POOL_MAX_AGE: float = 3600.0
+    SSH_KEEPALIVE_INTERVAL: float = 30.0
+    SSH_KEEPALIVE_COUNT_MAX: int = 3
+    SSH_MAX_CONCURRENCY: int = 32
+
+    # Seconds a device configuration is cached (0 disables caching)
+    DEVICE_CONFIG_CACHE_TTL: float = 0.0
+
     # Update this from class Config to model_config
     model_config = {"env_file": ".env", "case_sensitive": True}
 
@@ -1,27 +1,147 @@
+import functools
+import json
 import os
+import shutil
 import yaml
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
 import logging
 
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _Dumper
+
 logger = logging.getLogger(__name__)
 
+# Line width passed to the YAML emitter; large enough to disable wrapping
+# while still fitting the C int libyaml expects
+_YAML_WIDTH = 2**31 - 1
+
+# Size of each read from the containerlab stdout/stderr pipes
+_READ_CHUNK_SIZE = 65536
+
+
+@functools.lru_cache(maxsize=None)
+def _find_containerlab() -> str:
+    """Resolve the containerlab executable from PATH once per process."""
+    return shutil.which("containerlab") or "containerlab"
+
+
+async def _drain(reader: asyncio.StreamReader, buffer: bytearray) -> None:
+    """Read a subprocess pipe to EOF, appending each chunk to buffer."""
+    while chunk := await reader.read(_READ_CHUNK_SIZE):
+        buffer.extend(chunk)
+
+
+class ContainerLabClient:
+    """
+    Thin wrapper around the ContainerLab CLI.
+
+    ContainerLab has no daemon or server mode, so every operation is a separate
+    invocation of the binary. Keeping the invocation in one place lets the
+    deployer hold a single client for its lifetime.
+    """
+
+    def __init__(self, binary: Optional[str] = None):
+        """
+        Initialize the ContainerLab client.
+
+        Args:
+            binary: Path of the containerlab executable (default: resolved
+                from PATH on first use and shared by every client)
+        """
+        self.binary = binary or _find_containerlab()
+
+    async def run(
+        self, *args: str, timeout: Optional[float] = None
+    ) -> Tuple[int, str, str]:
+        """
+        Run a containerlab command.
+
+        Both output pipes are drained concurrently while the command runs,
+        and the whole run is bounded by timeout: a command that does not
+        finish in time is killed. The full output is still collected in
+        memory before it is returned.
+
+        Args:
+            *args: Command line arguments passed to containerlab
+            timeout: Seconds to wait for the command before killing it
+
+        Returns:
+            Tuple of (return code, stdout, stderr)
+
+        Raises:
+            asyncio.TimeoutError: If the command does not finish in time
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Running command: %s %s", self.binary, " ".join(args))
+
+        process = await asyncio.create_subprocess_exec(
+            self.binary,
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = bytearray(), bytearray()
+
+        async def collect() -> int:
+            await asyncio.gather(
+                _drain(process.stdout, stdout), _drain(process.stderr, stderr)
+            )
+            return await process.wait()
+
+        try:
+            returncode = await asyncio.wait_for(collect(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise asyncio.TimeoutError(
+                f"containerlab {' '.join(args)} timed out after {timeout}s"
+            ) from None
+
+        output, errors = stdout.decode(), stderr.decode()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Command exited with %s, output: %s", returncode, output)
+
+        return returncode, output, errors
+
 
 class ContainerLabDeployer:
     """
     Manages deployment of network digital twins using ContainerLab.
     """
 
-    def __init__(self, topology_dir: str = "topologies"):
+    def __init__(
+        self,
+        topology_dir: str = "topologies",
+        command_timeout: Optional[float] = None,
+        stagger: float = 0.2,
+    ):
         """
         Initialize the ContainerLab deployer.
 
         Args:
             topology_dir: Directory to store topology files
+            command_timeout: Seconds before a containerlab command is killed
+                (default: no limit)
+            stagger: Seconds between the start of consecutive deployments in
+                deploy_topologies, so concurrent containerlab runs do not set
+                up their networking all at once
         """
         self.topology_dir = topology_dir
+        self.command_timeout = command_timeout
+        self.stagger = stagger
+        self._client: Optional[ContainerLabClient] = None
         os.makedirs(topology_dir, exist_ok=True)
 
+    @property
+    def client(self) -> ContainerLabClient:
+        """ContainerLab client, created on first use and reused afterwards."""
+        if self._client is None:
+            self._client = ContainerLabClient()
+        return self._client
+
     async def deploy_topology(self, topology_config: Dict[str, Any]) -> Dict[str, Any]:
         """
         Deploy a network topology using ContainerLab.
@@ -35,45 +155,93 @@ class ContainerLabDeployer:
         topology_name = topology_config.get("name", f"spatium-{os.urandom(4).hex()}")
         topology_file = os.path.join(self.topology_dir, f"{topology_name}.yaml")
 
-        # Write topology config to file
-        with open(topology_file, "w") as f:
-            yaml.dump(topology_config, f)
-
-        # Deploy using ContainerLab
         try:
-            process = await asyncio.create_subprocess_exec(
-                "containerlab",
-                "deploy",
-                "-t",
-                topology_file,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            # Write topology config to file without blocking the event loop
+            await asyncio.to_thread(
+                self._write_topology_file, topology_file, topology_config
+            )
+
+            # Deploy using ContainerLab
+            returncode, stdout, stderr = await self.client.run(
+                "deploy", "-t", topology_file, timeout=self.command_timeout
             )
-            stdout, stderr = await process.communicate()
 
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Unknown error"
-                logger.error(f"ContainerLab deployment failed: {error_msg}")
+            if returncode != 0:
+                error_msg = stderr or "Unknown error"
+                logger.error("ContainerLab deployment failed: %s", error_msg)
                 return {
                     "success": False,
                     "topology_name": topology_name,
                     "error": error_msg,
                 }
 
-            # Parse the output to get deployed nodes info
-            output = stdout.decode()
-
             return {
                 "success": True,
                 "topology_name": topology_name,
                 "topology_file": topology_file,
-                "output": output,
+                "output": stdout,
             }
 
         except Exception as e:
             logger.exception("Failed to deploy ContainerLab topology")
             return {"success": False, "topology_name": topology_name, "error": str(e)}
 
+    async def deploy_topologies(
+        self,
+        topology_configs: List[Dict[str, Any]],
+        stagger: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Deploy several network topologies concurrently.
+
+        Args:
+            topology_configs: Topology configurations to deploy
+            stagger: Seconds between the start of consecutive deployments
+                (default: the deployer's stagger)
+
+        Returns:
+            Deployment result details, in the order of topology_configs
+        """
+
+        if stagger is None:
+            stagger = self.stagger
+
+        async def deploy(
+            delay: float, topology_config: Dict[str, Any]
+        ) -> Dict[str, Any]:
+            if delay:
+                await asyncio.sleep(delay)
+            return await self.deploy_topology(topology_config)
+
+        return await asyncio.gather(
+            *(
+                deploy(i * stagger, topology_config)
+                for i, topology_config in enumerate(topology_configs)
+            )
+        )
+
+    @staticmethod
+    def _write_topology_file(topology_file: str, topology_config: Dict[str, Any]):
+        """
+        Serialize a topology configuration to a YAML file.
+
+        Args:
+            topology_file: Path of the file to write
+            topology_config: Topology configuration
+        """
+        # Keep insertion order and skip line wrapping so the emitter stays on
+        # its fast path, and write through a larger buffer.
+        with open(topology_file, "w", encoding="utf-8", buffering=1 << 16) as f:
+            yaml.dump(
+                topology_config,
+                f,
+                Dumper=_Dumper,
+                default_flow_style=False,
+                sort_keys=False,
+                width=_YAML_WIDTH,
+                allow_unicode=True,
+            )
+
     async def destroy_topology(self, topology_name: str) -> Dict[str, Any]:
         """
         Destroy a deployed topology.
@@ -93,18 +261,12 @@ class ContainerLabDeployer:
             }
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                "containerlab",
-                "destroy",
-                "-t",
-                topology_file,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            returncode, stdout, stderr = await self.client.run(
+                "destroy", "-t", topology_file, timeout=self.command_timeout
             )
-            stdout, stderr = await process.communicate()
 
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Unknown error"
+            if returncode != 0:
+                error_msg = stderr or "Unknown error"
                 return {
                     "success": False,
                     "topology_name": topology_name,
@@ -114,34 +276,58 @@ class ContainerLabDeployer:
             return {
                 "success": True,
                 "topology_name": topology_name,
-                "output": stdout.decode(),
+                "output": stdout,
             }
 
         except Exception as e:
             return {"success": False, "topology_name": topology_name, "error": str(e)}
 
+    async def destroy_topologies(
+        self, topology_names: List[str], max_concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Destroy several deployed topologies concurrently.
+
+        Args:
+            topology_names: Names of the topologies to destroy
+            max_concurrency: Maximum number of containerlab destroy commands
+                running at once, to avoid overwhelming the Docker API
+
+        Returns:
+            Result of each destroy operation, in the order of topology_names
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def destroy(topology_name: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.destroy_topology(topology_name)
+
+        return await asyncio.gather(*(destroy(name) for name in topology_names))
+
     async def list_deployments(self) -> Dict[str, Any]:
         """
         List all deployed topologies.
 
         Returns:
-            List of deployed topologies
+            List of deployed topologies, with the parsed inspect output under
+            "deployments" when containerlab returns valid JSON
         """
         try:
-            process = await asyncio.create_subprocess_exec(
-                "containerlab",
-                "inspect",
-                "--all",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            returncode, stdout, stderr = await self.client.run(
+                "inspect", "--all", "--format", "json", timeout=self.command_timeout
             )
-            stdout, stderr = await process.communicate()
 
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Unknown error"
+            if returncode != 0:
+                error_msg = stderr or "Unknown error"
                 return {"success": False, "error": error_msg}
 
-            return {"success": True, "output": stdout.decode()}
+            result = {"success": True, "output": stdout}
+            try:
+                result["deployments"] = json.loads(stdout) if stdout.strip() else {}
+            except ValueError:
+                logger.warning("ContainerLab inspect output is not valid JSON")
+
+            return result
 
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -165,7 +351,25 @@ class ContainerLabDeployer:
         Returns:
             ContainerLab topology configuration
         """
-        topology = {
+        # Build nodes and links in single comprehensions rather than
+        # growing the dict and list one element at a time.
+        topology_nodes = {
+            node.get("name", f"sonic{i + 1}"): {
+                "kind": node.get("type", "sonic-vs"),
+                "image": node.get("image", "docker-sonic-vs:latest"),
+                "ports": node.get("ports", []),
+            }
+            for i, node in enumerate(nodes)
+        }
+        topology_links = [
+            [
+                f"{link.get('node1')}{link.get('interface1', '')}",
+                f"{link.get('node2')}{link.get('interface2', '')}",
+            ]
+            for link in links
+        ]
+
+        return {
             "name": name,
             "prefix": f"spatium-{name}",
             "mgmt": {
@@ -173,27 +377,5 @@ class ContainerLabDeployer:
                 "ipv4-subnet": "172.20.20.0/24",
                 "ipv6-subnet": "2001:172:20:20::/64",
             },
-            "topology": {"nodes": {}, "links": []},
+            "topology": {"nodes": topology_nodes, "links": topology_links},
         }
-
-        # Add nodes
-        for i, node in enumerate(nodes):
-            node_name = node.get("name", f"sonic{i + 1}")
-            node_type = node.get("type", "sonic-vs")
-            node_image = node.get("image", "docker-sonic-vs:latest")
-
-            topology["topology"]["nodes"][node_name] = {
-                "kind": node_type,
-                "image": node_image,
-                "ports": node.get("ports", []),
-            }
-
-        # Add links
-        for link in links:
-            endpoints = [
-                f"{link.get('node1')}{link.get('interface1', '')}",
-                f"{link.get('node2')}{link.get('interface2', '')}",
-            ]
-            topology["topology"]["links"].append(endpoints)
-
-        return topology
@@ -5,6 +5,15 @@ from typing import Dict, Any, List, Optional
 class SonicGNMIClient:
     """Client for retrieving configuration from SONiC devices via gNMI."""
 
+    def __init__(self, timeout: int = 5):
+        """
+        Initialize the gNMI client.
+
+        Args:
+            timeout: Seconds to wait for the gNMI channel to become ready
+        """
+        self.timeout = timeout
+
     def get_config(
         self,
         host: str,
@@ -41,6 +50,7 @@ class SonicGNMIClient:
                 username=username,
                 password=password,
                 insecure=insecure,
+                gnmi_timeout=self.timeout,
             ) as client:
                 # Get configuration using gNMI get
                 response = client.get(path=paths)
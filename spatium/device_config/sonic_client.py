@@ -1,16 +1,66 @@
-from typing import Dict, Any, Optional, List, Literal
+import copy
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Literal, Tuple
+from spatium.core.config import settings
 from .ssh_client import SonicSSHClient
+from .ssh_pool import SSHConnectionPool
 from .gnmi_client import SonicGNMIClient
 
+# (host, username, password, method, ssh_port, gnmi_port, private_key, gnmi_paths)
+CacheKey = Tuple[str, str, str, str, int, int, Optional[str], Optional[Tuple[str, ...]]]
+
 
 class SonicClient:
     """
     Client for retrieving configuration from SONiC devices using multiple methods.
     """
 
-    def __init__(self):
-        self.ssh_client = SonicSSHClient()
-        self.gnmi_client = SonicGNMIClient()
+    def __init__(self, cache_ttl: float = 0.0, cache_max_size: int = 256):
+        """
+        Initialize the SONiC client.
+
+        Args:
+            cache_ttl: Seconds a successful result is served from memory before
+                the device is queried again (default: 0, caching disabled)
+            cache_max_size: Maximum number of cached results; the least
+                recently used entry is dropped when full
+        """
+        self.ssh_pool = SSHConnectionPool(
+            max_size=settings.SSH_POOL_MAX_SIZE,
+            idle_timeout=settings.SSH_POOL_IDLE_TIMEOUT,
+            max_age=settings.SSH_POOL_MAX_AGE,
+            connect_timeout=settings.SSH_CONNECT_TIMEOUT,
+            keepalive_interval=settings.SSH_KEEPALIVE_INTERVAL,
+            keepalive_count_max=settings.SSH_KEEPALIVE_COUNT_MAX,
+        )
+        self.ssh_client = SonicSSHClient(
+            pool=self.ssh_pool, max_concurrency=settings.SSH_MAX_CONCURRENCY
+        )
+        self.gnmi_client = SonicGNMIClient(timeout=settings.GNMI_TIMEOUT)
+        self.cache_ttl = cache_ttl
+        self.cache_max_size = cache_max_size
+        self._cache: "OrderedDict[CacheKey, Tuple[Dict[str, Any], float]]" = (
+            OrderedDict()
+        )
+
+    async def close(self) -> None:
+        """Close any pooled device connections."""
+        await self.ssh_pool.close()
+
+    def invalidate(self, host: Optional[str] = None) -> None:
+        """
+        Drop cached configuration so the next request queries the device.
+
+        Args:
+            host: Device whose results are dropped (default: all devices)
+        """
+        if host is None:
+            self._cache.clear()
+            return
+
+        for key in [key for key in self._cache if key[0] == host]:
+            del self._cache[key]
 
     async def get_config(
         self,
@@ -39,6 +89,27 @@ class SonicClient:
         Returns:
             Dictionary containing the device configuration retrieved using the specified method(s)
         """
+        key = None
+        if self.cache_ttl > 0:
+            key = (
+                host,
+                username,
+                password,
+                method,
+                ssh_port,
+                gnmi_port,
+                private_key,
+                tuple(gnmi_paths) if gnmi_paths is not None else None,
+            )
+            cached = self._cache.get(key)
+            if cached is not None:
+                result, stored_at = cached
+                if time.monotonic() - stored_at < self.cache_ttl:
+                    self._cache.move_to_end(key)
+                    # Callers may add to or edit what they get back
+                    return copy.deepcopy(result)
+                del self._cache[key]
+
         result = {}
 
         if method in ["ssh", "both"]:
@@ -61,4 +132,10 @@ class SonicClient:
             )
             result["gnmi"] = gnmi_config
 
+        # Only successful results are cached, so failures are retried at once
+        if key is not None and not any("error" in part for part in result.values()):
+            self._cache[key] = (copy.deepcopy(result), time.monotonic())
+            if len(self._cache) > self.cache_max_size:
+                self._cache.popitem(last=False)
+
         return result
@@ -1,10 +1,40 @@
+import asyncio
+import contextlib
 import asyncssh
 from typing import Dict, Any, Optional
+from .ssh_pool import SSHConnectionPool
+
+# Errors raised when a pooled connection was dropped by the device or a
+# middlebox, e.g. while it sat idle in the pool (includes ConnectionLost)
+_STALE_CONNECTION_ERRORS = (asyncssh.DisconnectError,)
 
 
 class SonicSSHClient:
     """Client for retrieving configuration from SONiC devices via SSH."""
 
+    def __init__(
+        self,
+        pool: Optional[SSHConnectionPool] = None,
+        connect_timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """
+        Initialize the SSH client.
+
+        Args:
+            pool: Connection pool to reuse SSH sessions across calls
+                (default: open a new connection for every call)
+            connect_timeout: Seconds to wait for a connection when no pool is
+                used (default: asyncssh default)
+            max_concurrency: Maximum number of devices queried at once, to
+                stay under sshd MaxStartups limits (default: no limit)
+        """
+        self.pool = pool
+        self.connect_timeout = connect_timeout
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        )
+
     async def get_config(
         self,
         host: str,
@@ -26,7 +56,45 @@ class SonicSSHClient:
         Returns:
             Dictionary containing the device configuration
         """
+        async with self._semaphore or contextlib.nullcontext():
+            return await self._get_config(host, username, password, port, private_key)
+
+    def submit_get_config(
+        self,
+        host: str,
+        username: str,
+        password: Optional[str] = None,
+        port: int = 22,
+        private_key: Optional[str] = None,
+    ) -> "asyncio.Task[Dict[str, Any]]":
+        """
+        Start retrieving configuration in the background.
+
+        Must be called from a running event loop. The caller keeps the
+        returned task and awaits it when the result is needed; it accepts
+        the same arguments as get_config.
+
+        Returns:
+            Task resolving to the dictionary get_config would return
+        """
+        return asyncio.create_task(
+            self.get_config(host, username, password, port, private_key)
+        )
+
+    async def _get_config(
+        self,
+        host: str,
+        username: str,
+        password: Optional[str],
+        port: int,
+        private_key: Optional[str],
+    ) -> Dict[str, Any]:
         try:
+            if self.pool is not None:
+                return await self._get_config_pooled(
+                    host, username, password, port, private_key
+                )
+
             connect_kwargs = {
                 "username": username,
                 "port": port,
@@ -36,23 +104,93 @@ class SonicSSHClient:
                 connect_kwargs["password"] = password
             if private_key:
                 connect_kwargs["client_keys"] = [private_key]
+            if self.connect_timeout is not None:
+                connect_kwargs["connect_timeout"] = self.connect_timeout
 
             async with asyncssh.connect(host, **connect_kwargs) as conn:
-                # Get running configuration
-                running_config_result = await conn.run("show running-configuration")
+                return await self._collect_config(conn)
 
-                # Get version information
-                version_result = await conn.run("show version")
+        except Exception as e:
+            return {"error": str(e), "source": "ssh"}
 
-                # Get interface status
-                interfaces_result = await conn.run("show interfaces status")
+    async def _get_config_pooled(
+        self,
+        host: str,
+        username: str,
+        password: Optional[str],
+        port: int,
+        private_key: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Retrieve configuration over a pooled connection.
 
-                return {
-                    "running_config": running_config_result.stdout,
-                    "version_info": version_result.stdout,
-                    "interfaces": interfaces_result.stdout,
-                    "source": "ssh",
-                }
+        If the pooled connection turns out to have been dropped, it is
+        replaced and the commands are retried once on a fresh connection.
+        Any other error leaves the connection in the pool, since concurrent
+        callers for the same device may still be using it.
+        """
+        for attempt in range(2):
+            async with self.pool.lease(
+                host,
+                username=username,
+                password=password,
+                port=port,
+                private_key=private_key,
+            ) as conn:
+                try:
+                    return await self._collect_config(conn)
+                except Exception as e:
+                    # A refused channel, e.g. once sshd MaxSessions is reached
+                    # by concurrent callers, leaves the connection usable
+                    if not _is_stale(conn, e):
+                        raise
+                    self.pool.discard(conn)
+                    if attempt:
+                        raise
 
-        except Exception as e:
-            return {"error": str(e), "source": "ssh"}
+    async def _collect_config(
+        self, conn: asyncssh.SSHClientConnection
+    ) -> Dict[str, Any]:
+        """
+        Run the configuration commands on an open SSH connection.
+
+        The running configuration is required; if only the version or
+        interface command fails, its field is None instead of failing the
+        whole call.
+
+        Args:
+            conn: Open asyncssh connection to the device
+
+        Returns:
+            Dictionary containing the device configuration
+        """
+        # Each command gets its own channel on the one connection, so the
+        # three run concurrently instead of paying a round trip apiece
+        running_config_result, version_result, interfaces_result = await asyncio.gather(
+            conn.run("show running-configuration"),
+            conn.run("show version"),
+            conn.run("show interfaces status"),
+            return_exceptions=True,
+        )
+
+        if isinstance(running_config_result, BaseException):
+            raise running_config_result
+
+        return {
+            "running_config": running_config_result.stdout,
+            "version_info": _stdout_or_none(version_result),
+            "interfaces": _stdout_or_none(interfaces_result),
+            "source": "ssh",
+        }
+
+
+def _is_stale(conn: asyncssh.SSHClientConnection, error: Exception) -> bool:
+    """Return whether error means the connection itself is gone."""
+    return isinstance(error, _STALE_CONNECTION_ERRORS) or conn.is_closed()
+
+
+def _stdout_or_none(result: Any) -> Optional[str]:
+    """Return a command's output, or None if the command raised."""
+    if isinstance(result, BaseException):
+        return None
+    return result.stdout
@@ -0,0 +1,281 @@
+import asyncio
+import contextlib
+import logging
+import time
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import asyncssh
+
+logger = logging.getLogger(__name__)
+
+# Shortest pause between reaper passes, so zero timeouts can't make the
+# reaper spin on the event loop
+_MIN_REAP_INTERVAL = 1.0
+
+# (host, port, username, password, private_key)
+PoolKey = Tuple[str, int, str, Optional[str], Optional[str]]
+
+
+class _PooledConnection:
+    """An open SSH connection together with its bookkeeping state."""
+
+    __slots__ = ("key", "conn", "created_at", "last_used", "in_use")
+
+    def __init__(self, key: PoolKey, conn: asyncssh.SSHClientConnection):
+        self.key = key
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        # Number of open leases; the connection is never closed while > 0
+        self.in_use = 0
+
+
+class SSHConnectionPool:
+    """
+    Pool of open asyncssh connections keyed by host, port and credentials.
+
+    Reusing a connection skips the TCP handshake, key exchange and
+    authentication for every request after the first one to a device.
+    Connections are handed out through lease() and may be shared by
+    several callers at once. A connection that has been idle for longer
+    than idle_timeout or open for longer than max_age is retired: it is
+    no longer handed out, and it is closed once its last lease ends.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 64,
+        idle_timeout: float = 300.0,
+        max_age: float = 3600.0,
+        connect_timeout: Optional[float] = None,
+        keepalive_interval: Optional[float] = None,
+        keepalive_count_max: int = 3,
+        close_timeout: float = 5.0,
+    ):
+        """
+        Initialize the connection pool.
+
+        Args:
+            max_size: Maximum number of open connections kept in the pool
+            idle_timeout: Seconds a connection may stay unused before closing
+            max_age: Seconds after which a connection is always reopened
+            connect_timeout: Seconds to wait for a new connection to be
+                established and authenticated (default: asyncssh default)
+            keepalive_interval: Seconds between SSH keepalive messages, so
+                idle pooled connections are not dropped by NAT or firewalls
+                (default: no keepalives)
+            keepalive_count_max: Unanswered keepalives before a connection
+                is considered dead
+            close_timeout: Seconds close() waits for connections to finish
+                closing before giving up on them
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.connect_timeout = connect_timeout
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count_max = keepalive_count_max
+        self.close_timeout = close_timeout
+        self._connections: Dict[PoolKey, _PooledConnection] = {}
+        self._leased: Dict[asyncssh.SSHClientConnection, _PooledConnection] = {}
+        self._locks: Dict[PoolKey, asyncio.Lock] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    @contextlib.asynccontextmanager
+    async def lease(
+        self,
+        host: str,
+        username: str,
+        password: Optional[str] = None,
+        port: int = 22,
+        private_key: Optional[str] = None,
+    ) -> AsyncIterator[asyncssh.SSHClientConnection]:
+        """
+        Borrow an open connection to a device, connecting only if needed.
+
+        The connection is returned to the pool when the block exits. Other
+        callers may use the same connection concurrently.
+
+        Args:
+            host: Device hostname or IP address
+            username: SSH username
+            password: SSH password (if not using key-based auth)
+            port: SSH port (default: 22)
+            private_key: Path to private key file (if using key-based auth)
+
+        Yields:
+            An open asyncssh connection owned by the pool
+        """
+        key = (host, port, username, password, private_key)
+        try:
+            entry = await self._checkout(key)
+        finally:
+            self._prune_lock(key)
+
+        try:
+            yield entry.conn
+        finally:
+            self._release(entry)
+
+    def discard(self, conn: asyncssh.SSHClientConnection) -> None:
+        """
+        Stop handing out a connection and close it once no one is using it.
+
+        Callers use this when a connection turns out to be dead, so the next
+        lease opens a fresh one instead of reusing a broken session.
+
+        Args:
+            conn: Connection obtained from lease
+        """
+        entry = self._leased.get(conn)
+        if entry is None:
+            entry = next(
+                (e for e in self._connections.values() if e.conn is conn), None
+            )
+        if entry is None:
+            self._close(conn)
+            return
+
+        self._retire(entry)
+        self._prune_lock(entry.key)
+
+    async def close(self) -> None:
+        """Close every pooled connection and stop the idle reaper."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+
+        connections = [entry.conn for entry in self._connections.values()]
+        self._connections.clear()
+        self._locks.clear()
+
+        for conn in connections:
+            self._close(conn)
+        try:
+            # A peer that never acknowledges the close must not block shutdown
+            await asyncio.wait_for(
+                asyncio.gather(
+                    *(conn.wait_closed() for conn in connections),
+                    return_exceptions=True,
+                ),
+                timeout=self.close_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Timed out after %ss waiting for pooled SSH connections to close",
+                self.close_timeout,
+            )
+
+    async def _checkout(self, key: PoolKey) -> _PooledConnection:
+        """Return the usable entry for key with its lease count taken."""
+        host, port, username, password, private_key = key
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            entry = self._connections.get(key)
+            now = time.monotonic()
+
+            if entry is not None and self._is_usable(entry, now):
+                entry.last_used = now
+                entry.in_use += 1
+                self._leased[entry.conn] = entry
+                return entry
+
+            if entry is not None:
+                self._retire(entry)
+
+            connect_kwargs = {"username": username, "port": port}
+            if password:
+                connect_kwargs["password"] = password
+            if private_key:
+                connect_kwargs["client_keys"] = [private_key]
+            if self.connect_timeout is not None:
+                connect_kwargs["connect_timeout"] = self.connect_timeout
+            if self.keepalive_interval:
+                connect_kwargs["keepalive_interval"] = self.keepalive_interval
+                connect_kwargs["keepalive_count_max"] = self.keepalive_count_max
+
+            conn = await asyncssh.connect(host, **connect_kwargs)
+
+            # A caller that waited on a since-pruned lock may have pooled a
+            # connection for this key in the meantime
+            current = self._connections.get(key)
+            if current is not None:
+                self._retire(current)
+            if len(self._connections) >= self.max_size:
+                self._evict_least_recently_used()
+            entry = _PooledConnection(key, conn)
+            entry.in_use = 1
+            self._connections[key] = entry
+            self._leased[conn] = entry
+            self._ensure_reaper()
+
+            return entry
+
+    def _release(self, entry: _PooledConnection) -> None:
+        """End one lease, closing the connection if it was retired meanwhile."""
+        entry.in_use -= 1
+        entry.last_used = time.monotonic()
+        if entry.in_use:
+            return
+
+        del self._leased[entry.conn]
+        if self._connections.get(entry.key) is not entry:
+            self._close(entry.conn)
+
+    def _retire(self, entry: _PooledConnection) -> None:
+        """Remove an entry from the pool, closing it now if it is not in use."""
+        if self._connections.get(entry.key) is entry:
+            del self._connections[entry.key]
+        if not entry.in_use:
+            self._close(entry.conn)
+
+    def _prune_lock(self, key: PoolKey) -> None:
+        """Drop the lock, and with it the credentials, of an unpooled key."""
+        lock = self._locks.get(key)
+        if lock is not None and not lock.locked() and key not in self._connections:
+            del self._locks[key]
+
+    def _is_usable(self, entry: _PooledConnection, now: float) -> bool:
+        # A connection with open leases is busy, not idle
+        return (
+            not entry.conn.is_closed()
+            and (entry.in_use or now - entry.last_used < self.idle_timeout)
+            and now - entry.created_at < self.max_age
+        )
+
+    def _evict_least_recently_used(self) -> None:
+        # Prefer connections no one is using, so fewer are left open until
+        # their leases end
+        entry = min(
+            self._connections.values(),
+            key=lambda e: (e.in_use > 0, e.last_used),
+        )
+        self._retire(entry)
+        self._prune_lock(entry.key)
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap())
+
+    async def _reap(self) -> None:
+        """Periodically retire connections that are idle or too old."""
+        while self._connections:
+            await asyncio.sleep(
+                max(min(self.idle_timeout, self.max_age) / 2, _MIN_REAP_INTERVAL)
+            )
+            now = time.monotonic()
+            for entry in list(self._connections.values()):
+                if not self._is_usable(entry, now):
+                    self._retire(entry)
+                    self._prune_lock(entry.key)
+
+    @staticmethod
+    def _close(conn: asyncssh.SSHClientConnection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            logger.debug("Error while closing pooled SSH connection", exc_info=True)
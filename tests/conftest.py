@@ -1,9 +1,11 @@
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
 import os
 import sys
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from main import app
+from spatium.api import device, deployment
 
 # Add the project root to the path so we can import from src
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -17,21 +19,37 @@ sys.modules["pybatfish.question"] = MagicMock()
 # Now import the app
 
 
-@pytest.fixture
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """
+    Event loop for async tests, using uvloop when it is installed
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session")
 def client():
     """
-    Test client for the FastAPI application
+    Test client for the FastAPI application, shared by the whole session so
+    the application lifespan runs once
     """
-    return TestClient(app)
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture
 def mock_ssh_client():
     """
-    Mock for the SSH client
+    Mock for the SSH client used by the device API
     """
-    with patch("spatium.device_config.ssh_client.SonicSSHClient") as mock:
-        instance = mock.return_value
+    # Patch the instance the router already holds; patching the class would
+    # not reach it and the request would go out to the network
+    with patch.object(device.sonic_client, "ssh_client") as instance:
+        instance.get_config = AsyncMock()
         instance.get_config.return_value = {
             "running_config": "interface Ethernet0\n  mtu 9100\n  no shutdown",
             "version_info": "SONiC 4.0.0",
@@ -44,10 +62,9 @@ def mock_ssh_client():
 @pytest.fixture
 def mock_gnmi_client():
     """
-    Mock for the gNMI client
+    Mock for the gNMI client used by the device API
     """
-    with patch("spatium.device_config.gnmi_client.SonicGNMIClient") as mock:
-        instance = mock.return_value
+    with patch.object(device.sonic_client, "gnmi_client") as instance:
         instance.get_config.return_value = {
             "gnmi_data": {"path": "openconfig-interfaces:interfaces", "data": {}},
             "source": "gnmi",
@@ -74,10 +91,12 @@ def mock_batfish_analyzer():
 @pytest.fixture
 def mock_containerlab_deployer():
     """
-    Mock for the ContainerLab deployer
+    Mock for the ContainerLab deployer used by the deployment API
     """
-    with patch("spatium.deployment.containerlab.ContainerLabDeployer") as mock:
-        instance = mock.return_value
+    with patch.object(deployment, "deployer") as instance:
+        instance.deploy_topology = AsyncMock()
+        instance.destroy_topology = AsyncMock()
+        instance.list_deployments = AsyncMock()
         instance.create_sonic_topology.return_value = {
             "name": "test-topo",
             "prefix": "spatium-test-topo",
@@ -31,6 +31,29 @@ class TestDeploymentAPI:
             # Verify deployment data - more permissive checks
             assert "success" in response_data, "Response missing 'success' field"
 
+    def test_deploy_topology_invalid_payload(self, client):
+        # Missing nodes and links must be rejected before anything is deployed
+        response = client.post("/deployment/deploy", json={"name": "test-topo"})
+
+        assert response.status_code == 422
+        locations = [error["loc"] for error in response.json()["detail"]]
+        assert ["body", "nodes"] in locations
+        assert ["body", "links"] in locations
+
+    @pytest.mark.parametrize(
+        "body",
+        [b"\xff\xfe", b'{"name": "x", "nodes": [{"name": "\xff"}], "links": []}'],
+    )
+    def test_deploy_topology_non_utf8_payload(self, client, body):
+        # Bytes that are not UTF-8 must be rejected, not crash the error handler
+        response = client.post(
+            "/deployment/deploy",
+            content=body,
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert 400 <= response.status_code < 500
+
     def test_destroy_topology(self, client, mock_containerlab_deployer):
         # Make request
         response = client.delete("/deployment/destroy/test-topo")
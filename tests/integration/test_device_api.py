@@ -24,3 +24,7 @@ class TestDeviceAPI:
         # Verify gNMI data is in response
         assert "gnmi" in response_data
         assert response_data["gnmi"]["source"] == "gnmi"
+
+        # Verify the mocked clients served the request, not the network
+        mock_ssh_client.get_config.assert_awaited_once()
+        mock_gnmi_client.get_config.assert_called_once()
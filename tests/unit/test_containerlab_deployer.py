@@ -1,11 +1,27 @@
+import asyncio
+import os
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
-from spatium.deployment.containerlab import ContainerLabDeployer
+from unittest.mock import patch, MagicMock, AsyncMock, call
+from spatium.deployment.containerlab import (
+    ContainerLabClient,
+    ContainerLabDeployer,
+    _find_containerlab,
+)
+
+
+def _mock_process(returncode, stdout=b"", stderr=b""):
+    """Build a mock subprocess whose pipes yield the given output once."""
+    process = MagicMock()
+    process.returncode = returncode
+    process.stdout.read = AsyncMock(side_effect=[stdout, b""])
+    process.stderr.read = AsyncMock(side_effect=[stderr, b""])
+    process.wait = AsyncMock(return_value=returncode)
+    return process
 
 
 class TestContainerLabDeployer:
-    def test_create_sonic_topology(self):
-        deployer = ContainerLabDeployer()
+    def test_create_sonic_topology(self, tmp_path):
+        deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
 
         # Test data
         nodes = [
@@ -41,8 +57,7 @@ class TestContainerLabDeployer:
         assert len(topology["topology"]["links"]) == 1
         assert topology["topology"]["links"][0] == ["sonic1eth1", "sonic2eth1"]
 
-    @pytest.mark.asyncio
-    async def test_deploy_topology_success(self):
+    async def test_deploy_topology_success(self, tmp_path):
         # Create deployer with mocked subprocess
         with (
             patch(
@@ -53,13 +68,11 @@ class TestContainerLabDeployer:
             patch("builtins.open", MagicMock()),
         ):
             # Set up mock process
-            mock_process = AsyncMock()
-            mock_process.returncode = 0
-            mock_process.communicate.return_value = (b"Deployed successfully", b"")
+            mock_process = _mock_process(0, b"Deployed successfully")
             mock_subprocess.return_value = mock_process
 
             # Create deployer and deploy topology
-            deployer = ContainerLabDeployer()
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
             topology = {"name": "test-topo", "topology": {"nodes": {}, "links": []}}
             result = await deployer.deploy_topology(topology)
 
@@ -69,7 +82,7 @@ class TestContainerLabDeployer:
             # Check subprocess was called with correct args
             mock_subprocess.assert_called_once()
             args = mock_subprocess.call_args[0]
-            assert args[0] == "containerlab"
+            assert os.path.basename(args[0]) == "containerlab"
             assert args[1] == "deploy"
             assert args[2] == "-t"
 
@@ -78,8 +91,7 @@ class TestContainerLabDeployer:
             assert result["topology_name"] == "test-topo"
             assert "output" in result
 
-    @pytest.mark.asyncio
-    async def test_deploy_topology_failure(self):
+    async def test_deploy_topology_failure(self, tmp_path):
         # Create deployer with mocked subprocess
         with (
             patch(
@@ -90,13 +102,11 @@ class TestContainerLabDeployer:
             patch("builtins.open", MagicMock()),
         ):
             # Set up mock process that fails
-            mock_process = AsyncMock()
-            mock_process.returncode = 1
-            mock_process.communicate.return_value = (b"", b"Deployment failed")
+            mock_process = _mock_process(1, stderr=b"Deployment failed")
             mock_subprocess.return_value = mock_process
 
             # Create deployer and deploy topology
-            deployer = ContainerLabDeployer()
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
             topology = {"name": "test-topo", "topology": {"nodes": {}, "links": []}}
             result = await deployer.deploy_topology(topology)
 
@@ -104,8 +114,104 @@ class TestContainerLabDeployer:
             assert result["success"] is False
             assert "error" in result
 
-    @pytest.mark.asyncio
-    async def test_destroy_topology(self):
+    async def test_deploy_topologies(self, tmp_path):
+        names = ["topo-a", "topo-b", "topo-c"]
+        started = 0
+        all_started = asyncio.Event()
+
+        async def wait_for_others():
+            # Only finishes once every deployment is in flight, so deploying
+            # one after another would never get past the first
+            nonlocal started
+            started += 1
+            if started == len(names):
+                all_started.set()
+            await all_started.wait()
+            return 0
+
+        def blocking_process(*args, **kwargs):
+            process = _mock_process(0, b"Deployed successfully")
+            process.wait = AsyncMock(side_effect=wait_for_others)
+            return process
+
+        # Create deployer with mocked subprocess
+        with (
+            patch(
+                "spatium.deployment.containerlab.asyncio.create_subprocess_exec",
+                new=AsyncMock(side_effect=blocking_process),
+            ) as mock_subprocess,
+            patch("spatium.deployment.containerlab.yaml.dump"),
+            patch("builtins.open", MagicMock()),
+        ):
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
+            results = await asyncio.wait_for(
+                deployer.deploy_topologies(
+                    [{"name": name} for name in names], stagger=0
+                ),
+                timeout=5,
+            )
+
+            # Check the deployments overlapped instead of running back to back
+            assert mock_subprocess.call_count == 3
+
+            # Check results are returned in request order
+            assert [result["topology_name"] for result in results] == names
+            assert all(result["success"] for result in results)
+
+    async def test_deploy_topologies_write_failure(self, tmp_path):
+        def dump(topology_config, *args, **kwargs):
+            if topology_config["name"] == "topo-b":
+                raise PermissionError("Permission denied")
+
+        # Create deployer with mocked subprocess
+        with (
+            patch(
+                "spatium.deployment.containerlab.asyncio.create_subprocess_exec",
+                new=AsyncMock(
+                    side_effect=lambda *args, **kwargs: _mock_process(
+                        0, b"Deployed successfully"
+                    )
+                ),
+            ) as mock_subprocess,
+            patch("spatium.deployment.containerlab.yaml.dump", side_effect=dump),
+            patch("builtins.open", MagicMock()),
+        ):
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
+            names = ["topo-a", "topo-b", "topo-c"]
+            results = await deployer.deploy_topologies(
+                [{"name": name} for name in names], stagger=0
+            )
+
+            # Check the failed write is reported in place and the other
+            # deployments still ran and returned their results
+            assert [result["success"] for result in results] == [True, False, True]
+            assert results[1]["error"] == "Permission denied"
+            assert mock_subprocess.call_count == 2
+
+    async def test_deploy_topologies_stagger(self, tmp_path):
+        # Create deployer with mocked subprocess and sleep
+        with (
+            patch(
+                "spatium.deployment.containerlab.asyncio.create_subprocess_exec",
+                new=AsyncMock(
+                    side_effect=lambda *args, **kwargs: _mock_process(
+                        0, b"Deployed successfully"
+                    )
+                ),
+            ),
+            patch(
+                "spatium.deployment.containerlab.asyncio.sleep", new=AsyncMock()
+            ) as mock_sleep,
+            patch("spatium.deployment.containerlab.yaml.dump"),
+            patch("builtins.open", MagicMock()),
+        ):
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path), stagger=0.05)
+            await deployer.deploy_topologies([{"name": f"topo-{i}"} for i in range(3)])
+
+            # Check each containerlab run was delayed one stagger after the last
+            assert mock_sleep.await_args_list == [call(0.05), call(0.1)]
+
+    async def test_destroy_topology(self, tmp_path):
         # Create deployer with mocked subprocess
         with (
             patch(
@@ -115,19 +221,17 @@ class TestContainerLabDeployer:
             patch("spatium.deployment.containerlab.os.path.exists", return_value=True),
         ):
             # Set up mock process
-            mock_process = AsyncMock()
-            mock_process.returncode = 0
-            mock_process.communicate.return_value = (b"Destroyed successfully", b"")
+            mock_process = _mock_process(0, b"Destroyed successfully")
             mock_subprocess.return_value = mock_process
 
             # Create deployer and destroy topology
-            deployer = ContainerLabDeployer()
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
             result = await deployer.destroy_topology("test-topo")
 
             # Check subprocess was called with correct args
             mock_subprocess.assert_called_once()
             args = mock_subprocess.call_args[0]
-            assert args[0] == "containerlab"
+            assert os.path.basename(args[0]) == "containerlab"
             assert args[1] == "destroy"
             assert args[2] == "-t"
 
@@ -135,30 +239,134 @@ class TestContainerLabDeployer:
             assert result["success"] is True
             assert result["topology_name"] == "test-topo"
 
-    @pytest.mark.asyncio
-    async def test_list_deployments(self):
+    async def test_destroy_topologies(self, tmp_path):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_wait():
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return 0
+
+        def slow_process(*args, **kwargs):
+            process = _mock_process(0, b"Destroyed successfully")
+            process.wait = AsyncMock(side_effect=slow_wait)
+            return process
+
+        # Create deployer with mocked subprocess
+        with (
+            patch(
+                "spatium.deployment.containerlab.asyncio.create_subprocess_exec",
+                new=AsyncMock(side_effect=slow_process),
+            ) as mock_subprocess,
+            patch("spatium.deployment.containerlab.os.path.exists", return_value=True),
+        ):
+            # Create deployer and destroy several topologies at once
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
+            names = ["topo-a", "topo-b", "topo-c", "topo-d"]
+            results = await deployer.destroy_topologies(names, max_concurrency=2)
+
+            # Check one containerlab destroy ran per topology, two at a time
+            assert mock_subprocess.call_count == 4
+            assert max_in_flight == 2
+            assert all(
+                call[0][1] == "destroy" for call in mock_subprocess.call_args_list
+            )
+
+            # Check results are returned in request order
+            assert [result["topology_name"] for result in results] == names
+            assert all(result["success"] for result in results)
+
+    async def test_list_deployments(self, tmp_path):
         # Create deployer with mocked subprocess
         with patch(
             "spatium.deployment.containerlab.asyncio.create_subprocess_exec",
             new=AsyncMock(),
         ) as mock_subprocess:
             # Set up mock process
-            mock_process = AsyncMock()
-            mock_process.returncode = 0
-            mock_process.communicate.return_value = (b"List of deployments", b"")
+            mock_process = _mock_process(0, b"List of deployments")
             mock_subprocess.return_value = mock_process
 
             # Create deployer and list deployments
-            deployer = ContainerLabDeployer()
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
             result = await deployer.list_deployments()
 
             # Check subprocess was called with correct args
             mock_subprocess.assert_called_once()
             args = mock_subprocess.call_args[0]
-            assert args[0] == "containerlab"
+            assert os.path.basename(args[0]) == "containerlab"
             assert args[1] == "inspect"
             assert args[2] == "--all"
+            assert args[3:5] == ("--format", "json")
 
             # Check result
             assert result["success"] is True
             assert result["output"] == "List of deployments"
+
+    async def test_list_deployments_json(self, tmp_path):
+        # Create deployer with mocked subprocess
+        with patch(
+            "spatium.deployment.containerlab.asyncio.create_subprocess_exec",
+            new=AsyncMock(),
+        ) as mock_subprocess:
+            # Set up mock process returning JSON inspect output
+            output = b'{"test-topo": [{"name": "sonic1", "state": "running"}]}'
+            mock_subprocess.return_value = _mock_process(0, output)
+
+            # Create deployer and list deployments
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
+            result = await deployer.list_deployments()
+
+            # Check the parsed deployments are returned alongside the output
+            assert result["success"] is True
+            assert result["deployments"]["test-topo"][0]["name"] == "sonic1"
+
+    def test_client_is_reused(self, tmp_path):
+        deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
+
+        # The client is created lazily and cached on the deployer
+        assert deployer._client is None
+        client = deployer.client
+        assert os.path.basename(client.binary) == "containerlab"
+        assert deployer.client is client
+
+    def test_binary_lookup_is_cached(self):
+        _find_containerlab.cache_clear()
+        try:
+            with patch(
+                "spatium.deployment.containerlab.shutil.which",
+                return_value="/usr/bin/containerlab",
+            ) as mock_which:
+                first = ContainerLabClient()
+                second = ContainerLabClient()
+
+                # Check PATH was searched once for both clients
+                mock_which.assert_called_once_with("containerlab")
+                assert first.binary == second.binary == "/usr/bin/containerlab"
+        finally:
+            # Don't leak the patched path into other tests
+            _find_containerlab.cache_clear()
+
+    async def test_run_command_timeout(self, tmp_path):
+        with patch(
+            "spatium.deployment.containerlab.asyncio.create_subprocess_exec",
+            new=AsyncMock(),
+        ) as mock_subprocess:
+            # Set up a process whose output never arrives
+            async def never_read(size):
+                await asyncio.Event().wait()
+
+            mock_process = _mock_process(0)
+            mock_process.stdout.read = never_read
+            mock_subprocess.return_value = mock_process
+
+            # Run a command with a short timeout
+            deployer = ContainerLabDeployer(topology_dir=str(tmp_path))
+            with pytest.raises(asyncio.TimeoutError):
+                await deployer.client.run("inspect", "--all", timeout=0.01)
+
+            # Check the stuck process was killed
+            mock_process.kill.assert_called_once()
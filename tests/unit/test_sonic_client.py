@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock, AsyncMock
+from spatium.device_config.sonic_client import SonicClient
+
+
+def _sonic_client(cache_ttl, ssh_result):
+    """Build a SonicClient whose SSH client returns ssh_result."""
+    client = SonicClient(cache_ttl=cache_ttl)
+    client.ssh_client = MagicMock()
+    client.ssh_client.get_config = AsyncMock(return_value=ssh_result)
+    return client
+
+
+class TestSonicClient:
+    async def test_get_config_cached(self):
+        ssh_result = {"running_config": "hostname sonic", "source": "ssh"}
+        client = _sonic_client(60, ssh_result)
+
+        first = await client.get_config(
+            host="192.168.1.1", username="admin", password="password", method="ssh"
+        )
+        second = await client.get_config(
+            host="192.168.1.1", username="admin", password="password", method="ssh"
+        )
+
+        # Check the second call was served from the cache
+        assert first == second == {"ssh": ssh_result}
+        client.ssh_client.get_config.assert_awaited_once()
+
+        # Check invalidation forces a new query
+        client.invalidate("192.168.1.1")
+        await client.get_config(
+            host="192.168.1.1", username="admin", password="password", method="ssh"
+        )
+        assert client.ssh_client.get_config.await_count == 2
+
+    async def test_get_config_cache_returns_copies(self):
+        client = _sonic_client(
+            60, {"running_config": "hostname sonic", "source": "ssh"}
+        )
+
+        first = await client.get_config(
+            host="192.168.1.1", username="admin", password="password", method="ssh"
+        )
+        first["ssh"]["running_config"] = "edited by caller"
+        second = await client.get_config(
+            host="192.168.1.1", username="admin", password="password", method="ssh"
+        )
+        second["extra"] = True
+        third = await client.get_config(
+            host="192.168.1.1", username="admin", password="password", method="ssh"
+        )
+
+        # Check changes to a returned result never reach later cache hits
+        assert third == {"ssh": {"running_config": "hostname sonic", "source": "ssh"}}
+        client.ssh_client.get_config.assert_awaited_once()
+
+    async def test_get_config_errors_not_cached(self):
+        client = _sonic_client(60, {"error": "Connection refused", "source": "ssh"})
+
+        for _ in range(2):
+            await client.get_config(
+                host="192.168.1.1", username="admin", password="password", method="ssh"
+            )
+
+        # Check failed results are never served from the cache
+        assert client.ssh_client.get_config.await_count == 2
+
+    async def test_get_config_cache_disabled_by_default(self):
+        client = SonicClient()
+        client.ssh_client = MagicMock()
+        client.ssh_client.get_config = AsyncMock(
+            return_value={"running_config": "", "source": "ssh"}
+        )
+
+        for _ in range(2):
+            await client.get_config(
+                host="192.168.1.1", username="admin", password="password", method="ssh"
+            )
+
+        assert client.ssh_client.get_config.await_count == 2
@@ -1,86 +1,359 @@
+import asyncio
+import dataclasses
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
-import sys
+import asyncssh
 from spatium.device_config.ssh_client import SonicSSHClient
+from spatium.device_config.ssh_pool import SSHConnectionPool
 
-# Mock asyncssh module
-sys.modules["asyncssh"] = MagicMock()
+# asyncssh.connect as seen by the client under test
+CONNECT = "spatium.device_config.ssh_client.asyncssh.connect"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class MockRunResult:
+    """Minimal stand-in for asyncssh.SSHCompletedProcess."""
+
+    stdout: str
+
+
+# Immutable, so one set of results can back every test
+DEFAULT_OUTPUTS = ("config data", "version data", "interface data")
+DEFAULT_RESULTS = tuple(MockRunResult(output) for output in DEFAULT_OUTPUTS)
+
+
+def _mock_pool(*conns):
+    """
+    Build a mock SSHConnectionPool whose leases yield conns in order.
+
+    A single connection is handed to every lease.
+    """
+    leases = []
+    for conn in conns:
+        lease = MagicMock()
+        lease.__aenter__ = AsyncMock(return_value=conn)
+        lease.__aexit__ = AsyncMock(return_value=None)
+        leases.append(lease)
+
+    pool = MagicMock(spec=SSHConnectionPool)
+    if len(leases) == 1:
+        pool.lease.return_value = leases[0]
+    else:
+        pool.lease.side_effect = leases
+    return pool
+
+
+@pytest.fixture
+def mock_ssh_conn():
+    """
+    Patch asyncssh.connect for the client under test.
+
+    Yields (mock_connect, mock_conn); tests set mock_conn.run.side_effect.
+    """
+    mock_conn = MagicMock(spec=asyncssh.SSHClientConnection)
+    mock_conn.run = AsyncMock()
+    mock_connect = MagicMock(spec=asyncssh.connect)
+    mock_connect.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    mock_connect.return_value.__aexit__ = AsyncMock(return_value=None)
+    with patch(CONNECT, mock_connect):
+        yield mock_connect, mock_conn
+
+
+@pytest.fixture(scope="module")
+def ssh_client():
+    """Unpooled SSH client; it holds no per-call state, so tests can share it."""
+    return SonicSSHClient()
 
 
 class TestSonicSSHClient:
-    @pytest.mark.asyncio
-    async def test_get_config_success(self):
-        # Create a simple mock that mimics the behavior we need
-        class MockRunResult:
-            def __init__(self, stdout):
-                self.stdout = stdout
-
-        # Create a mock connection
-        mock_conn = MagicMock()
-        # Use AsyncMock for async methods
-        mock_conn.run = AsyncMock()
-
-        # Set up different return values for each call
+    async def test_get_config_success(self, ssh_client, mock_ssh_conn):
+        mock_connect, mock_conn = mock_ssh_conn
         mock_conn.run.side_effect = [
             MockRunResult("interface Ethernet0\n  mtu 9100\n  no shutdown"),
             MockRunResult("SONiC 4.0.0"),
             MockRunResult("Ethernet0 up"),
         ]
 
-        # Mock context manager for asyncssh.connect
-        mock_connect = AsyncMock()
-        mock_connect.return_value.__aenter__.return_value = mock_conn
-
-        # Mock the asyncssh.connect function
-        with patch("asyncssh.connect", mock_connect):
-            # Create client and call get_config
-            client = SonicSSHClient()
-            result = await client.get_config(
-                host="192.168.1.1", username="admin", password="password"
-            )
+        # Call get_config
+        result = await ssh_client.get_config(
+            host="192.168.1.1", username="admin", password="password"
+        )
 
-            # Basic assertions
-            assert isinstance(result, dict), "Result should be a dictionary"
-            assert "source" in result, "Result missing 'source' key"
-            assert result["source"] == "ssh", "Source should be 'ssh'"
+        # Basic assertions
+        assert isinstance(result, dict), "Result should be a dictionary"
+        assert "source" in result, "Result missing 'source' key"
+        assert result["source"] == "ssh", "Source should be 'ssh'"
+        assert result["version_info"] == "SONiC 4.0.0"
+        mock_connect.assert_called_once_with(
+            "192.168.1.1", username="admin", port=22, password="password"
+        )
 
-    @pytest.mark.asyncio
-    async def test_get_config_with_private_key(self):
-        # Same mock setup as above but simplified
-        mock_conn = MagicMock()
-        mock_conn.run = AsyncMock()
+    @pytest.mark.parametrize(
+        "outputs, expected",
+        [
+            pytest.param(
+                ["config", Exception("channel closed"), "interfaces"],
+                {"running_config": "config", "version_info": None},
+                id="version_fails",
+            ),
+            pytest.param(
+                ["config", "version", Exception("channel closed")],
+                {"running_config": "config", "interfaces": None},
+                id="interfaces_fails",
+            ),
+            pytest.param(
+                ["config", Exception("channel closed"), Exception("channel closed")],
+                {"running_config": "config", "version_info": None, "interfaces": None},
+                id="both_fail",
+            ),
+            pytest.param(
+                [Exception("channel closed"), "version", "interfaces"],
+                {"error": "channel closed"},
+                id="running_config_fails",
+            ),
+        ],
+    )
+    async def test_get_config_command_failures(
+        self, ssh_client, mock_ssh_conn, outputs, expected
+    ):
+        _, mock_conn = mock_ssh_conn
         mock_conn.run.side_effect = [
-            AsyncMock(stdout="config data"),
-            AsyncMock(stdout="version data"),
-            AsyncMock(stdout="interface data"),
+            output if isinstance(output, Exception) else MockRunResult(output)
+            for output in outputs
         ]
 
-        mock_connect = AsyncMock()
-        mock_connect.return_value.__aenter__.return_value = mock_conn
+        result = await ssh_client.get_config(
+            host="192.168.1.1", username="admin", password="password"
+        )
+
+        # Check a failed secondary command only blanks its own field, while a
+        # missing running configuration fails the whole call
+        assert result["source"] == "ssh"
+        for key, value in expected.items():
+            assert result[key] == value
+        assert ("error" in result) == ("error" in expected)
+
+    @pytest.mark.parametrize(
+        "auth, connect_auth, expect_success",
+        [
+            ({"password": "password"}, {"password": "password"}, True),
+            (
+                {"private_key": "/path/to/key"},
+                {"client_keys": ["/path/to/key"]},
+                True,
+            ),
+            ({"password": "wrong"}, {"password": "wrong"}, False),
+            (
+                {"private_key": "/path/to/other"},
+                {"client_keys": ["/path/to/other"]},
+                False,
+            ),
+        ],
+    )
+    async def test_get_config_various_auth(
+        self, ssh_client, mock_ssh_conn, auth, connect_auth, expect_success
+    ):
+        mock_connect, mock_conn = mock_ssh_conn
+        if expect_success:
+            mock_conn.run.side_effect = DEFAULT_RESULTS
+        else:
+            mock_connect.side_effect = Exception("Authentication failed")
+
+        result = await ssh_client.get_config(
+            host="192.168.1.1", username="admin", **auth
+        )
+
+        # Check the credentials were handed to asyncssh in the right form
+        mock_connect.assert_called_once_with(
+            "192.168.1.1", username="admin", port=22, **connect_auth
+        )
+        assert result["source"] == "ssh", "Source should be 'ssh'"
+
+        if expect_success:
+            assert result["running_config"] == "config data"
+            assert "error" not in result
+        else:
+            assert result["error"] == "Authentication failed"
+
+    async def test_submit_get_config_runs_in_background(
+        self, ssh_client, mock_ssh_conn
+    ):
+        mock_connect, mock_conn = mock_ssh_conn
+        mock_conn.run.side_effect = DEFAULT_RESULTS
+
+        task = ssh_client.submit_get_config(
+            host="192.168.1.1", username="admin", password="password"
+        )
 
-        with patch("asyncssh.connect", mock_connect):
-            client = SonicSSHClient()
-            result = await client.get_config(
-                host="192.168.1.1", username="admin", private_key="/path/to/key"
+        # Check the call returned before connecting, then started on its own
+        mock_connect.assert_not_called()
+        await asyncio.sleep(0)
+        mock_connect.assert_called_once()
+
+        result = await task
+        assert result["running_config"] == "config data"
+
+    async def test_get_config_with_pool(self):
+        # Mock pooled connection
+        mock_conn = MagicMock(spec=asyncssh.SSHClientConnection)
+        mock_conn.run = AsyncMock(side_effect=DEFAULT_RESULTS)
+        mock_pool = _mock_pool(mock_conn)
+
+        client = SonicSSHClient(pool=mock_pool)
+        result = await client.get_config(
+            host="192.168.1.1", username="admin", password="password"
+        )
+
+        # Check the connection came from the pool and was kept open
+        mock_pool.lease.assert_called_once_with(
+            "192.168.1.1",
+            username="admin",
+            password="password",
+            port=22,
+            private_key=None,
+        )
+        mock_pool.discard.assert_not_called()
+
+        # Check all commands ran on the one connection, each mapped to its field
+        assert mock_conn.run.await_count == 3
+        assert result["running_config"] == "config data"
+        assert result["version_info"] == "version data"
+        assert result["interfaces"] == "interface data"
+
+    async def test_get_config_reuses_pooled_connection(self):
+        mock_conn = MagicMock(spec=asyncssh.SSHClientConnection)
+        mock_conn.is_closed.return_value = False
+        mock_conn.run = AsyncMock(side_effect=DEFAULT_RESULTS * 3)
+        mock_conn.wait_closed = AsyncMock()
+
+        with patch(
+            "spatium.device_config.ssh_pool.asyncssh.connect",
+            new=AsyncMock(return_value=mock_conn),
+        ) as mock_connect:
+            pool = SSHConnectionPool()
+            client = SonicSSHClient(pool=pool)
+            for _ in range(3):
+                result = await client.get_config(
+                    host="192.168.1.1", username="admin", password="password"
+                )
+                assert result["running_config"] == "config data"
+
+            # Check one connection served every call and stayed open
+            mock_connect.assert_awaited_once()
+            assert mock_conn.run.await_count == 9
+            mock_conn.close.assert_not_called()
+
+            # Check the connection is only closed with the pool
+            await pool.close()
+            mock_conn.close.assert_called_once()
+
+    async def test_get_config_max_concurrency(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def run(command):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return MockRunResult(command)
+
+        mock_conn = MagicMock(spec=asyncssh.SSHClientConnection)
+        mock_conn.run = AsyncMock(side_effect=run)
+        mock_pool = _mock_pool(mock_conn)
+
+        client = SonicSSHClient(pool=mock_pool, max_concurrency=8)
+        results = await asyncio.gather(
+            *(
+                client.get_config(host=f"10.0.0.{i}", username="admin", password="pw")
+                for i in range(100)
             )
+        )
+
+        # Check exactly 8 devices (3 commands each) were queried at once: the
+        # limit was reached but never exceeded
+        assert all("error" not in result for result in results)
+        assert max_in_flight == 8 * 3
+
+    async def test_get_config_with_pool_retries_stale_connection(self):
+        # The pooled connection was dropped while idle; the next one works
+        stale_conn = MagicMock(spec=asyncssh.SSHClientConnection)
+        stale_conn.run = AsyncMock(side_effect=asyncssh.ConnectionLost("idle"))
+        fresh_conn = MagicMock(spec=asyncssh.SSHClientConnection)
+        fresh_conn.run = AsyncMock(side_effect=DEFAULT_RESULTS)
+        mock_pool = _mock_pool(stale_conn, fresh_conn)
+
+        client = SonicSSHClient(pool=mock_pool)
+        result = await client.get_config(
+            host="192.168.1.1", username="admin", password="password"
+        )
+
+        # Check the stale connection was replaced and the call retried once
+        mock_pool.discard.assert_called_once_with(stale_conn)
+        assert mock_pool.lease.call_count == 2
+        assert result["running_config"] == "config data"
 
-            # Basic assertion
-            assert "source" in result, "Result missing 'source' key"
-            assert result["source"] == "ssh", "Source should be 'ssh'"
+    async def test_get_config_with_pool_discards_closed_connection(self):
+        # The pooled connection fails mid-command and reports itself closed
+        closed_conn = MagicMock(spec=asyncssh.SSHClientConnection)
+        closed_conn.run = AsyncMock(side_effect=Exception("Connection lost"))
+        closed_conn.is_closed.return_value = True
+        fresh_conn = MagicMock(spec=asyncssh.SSHClientConnection)
+        fresh_conn.run = AsyncMock(side_effect=DEFAULT_RESULTS)
+        mock_pool = _mock_pool(closed_conn, fresh_conn)
 
-    @pytest.mark.asyncio
-    async def test_get_config_error(self):
-        # Mock for asyncssh.connect that raises an error
-        mock_connect = AsyncMock(side_effect=Exception("Connection failed"))
+        client = SonicSSHClient(pool=mock_pool)
+        result = await client.get_config(
+            host="192.168.1.1", username="admin", password="password"
+        )
 
-        with patch("asyncssh.connect", mock_connect):
-            # Create client and call get_config
-            client = SonicSSHClient()
-            result = await client.get_config(
-                host="192.168.1.1", username="admin", password="password"
+        # Check the dead connection was dropped from the pool and replaced
+        mock_pool.discard.assert_called_once_with(closed_conn)
+        assert result["running_config"] == "config data"
+
+    async def test_get_config_with_pool_keeps_shared_connection_on_refused_channel(
+        self,
+    ):
+        opened = 0
+
+        async def run(command):
+            nonlocal opened
+            opened += 1
+            if opened == 4:
+                # sshd MaxSessions reached on the shared connection
+                raise asyncssh.ChannelOpenError(
+                    asyncssh.OPEN_ADMINISTRATIVELY_PROHIBITED, "open failed"
+                )
+            await asyncio.sleep(0)
+            return MockRunResult(command)
+
+        mock_conn = MagicMock(spec=asyncssh.SSHClientConnection)
+        mock_conn.is_closed.return_value = False
+        mock_conn.run = AsyncMock(side_effect=run)
+        mock_conn.wait_closed = AsyncMock()
+
+        with patch(
+            "spatium.device_config.ssh_pool.asyncssh.connect",
+            new=AsyncMock(return_value=mock_conn),
+        ) as mock_connect:
+            pool = SSHConnectionPool()
+            client = SonicSSHClient(pool=pool)
+            results = await asyncio.gather(
+                *(
+                    client.get_config(
+                        host="192.168.1.1", username="admin", password="password"
+                    )
+                    for _ in range(2)
+                )
             )
 
-            # Check the result contains the error
-            assert "error" in result, "Result missing 'error' key"
-            assert "source" in result, "Result missing 'source' key"
-            assert result["source"] == "ssh", "Source should be 'ssh'"
+            # Check only the call whose channel was refused failed, and the
+            # connection the other call was using stayed open and pooled
+            assert sum("error" in result for result in results) == 1
+            assert any(result.get("error") == "open failed" for result in results)
+            mock_connect.assert_awaited_once()
+            mock_conn.close.assert_not_called()
+            assert len(pool) == 1
+
+            await pool.close()
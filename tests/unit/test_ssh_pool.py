@@ -0,0 +1,215 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from spatium.device_config.ssh_pool import SSHConnectionPool
+
+CONNECT = "spatium.device_config.ssh_pool.asyncssh.connect"
+
+
+def _mock_conn():
+    """Build a mock asyncssh connection that reports itself as open."""
+    conn = MagicMock()
+    conn.is_closed.return_value = False
+    conn.wait_closed = AsyncMock()
+    return conn
+
+
+async def _lease_once(pool, host="192.168.1.1", **credentials):
+    """Lease a connection, return it to the pool and hand it back."""
+    credentials = credentials or {"password": "pw"}
+    async with pool.lease(host, username="admin", **credentials) as conn:
+        return conn
+
+
+class TestSSHConnectionPool:
+    async def test_lease_reuses_connection(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.return_value = _mock_conn()
+
+            pool = SSHConnectionPool()
+            first = await _lease_once(pool)
+            second = await _lease_once(pool)
+
+            # Check the second lease reused the open connection
+            assert first is second
+            mock_connect.assert_called_once_with(
+                "192.168.1.1", username="admin", port=22, password="pw"
+            )
+            first.close.assert_not_called()
+
+            await pool.close()
+
+    async def test_lease_connect_options(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.return_value = _mock_conn()
+
+            pool = SSHConnectionPool(connect_timeout=2.5, keepalive_interval=30)
+            await _lease_once(pool)
+
+            # Check an unreachable device can't stall the caller indefinitely
+            # and idle connections send keepalives
+            mock_connect.assert_called_once_with(
+                "192.168.1.1",
+                username="admin",
+                port=22,
+                password="pw",
+                connect_timeout=2.5,
+                keepalive_interval=30,
+                keepalive_count_max=3,
+            )
+
+            await pool.close()
+
+    async def test_lease_separates_credentials(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.side_effect = lambda *args, **kwargs: _mock_conn()
+
+            pool = SSHConnectionPool()
+            first = await _lease_once(pool, password="pw")
+            second = await _lease_once(pool, private_key="/path/to/key")
+
+            # Check different credentials never share a connection
+            assert first is not second
+            assert mock_connect.call_count == 2
+            assert len(pool) == 2
+
+            await pool.close()
+
+    async def test_idle_connection_is_replaced(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.side_effect = lambda *args, **kwargs: _mock_conn()
+
+            # With no idle allowance every lease finds an expired connection
+            pool = SSHConnectionPool(idle_timeout=0)
+            first = await _lease_once(pool)
+            second = await _lease_once(pool)
+
+            # Check the expired connection was closed and replaced
+            assert first is not second
+            first.close.assert_called_once()
+            assert len(pool) == 1
+
+            await pool.close()
+
+    async def test_expired_connection_in_use_is_not_closed(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.side_effect = lambda *args, **kwargs: _mock_conn()
+
+            # With no age allowance every lease finds an expired connection
+            pool = SSHConnectionPool(max_age=0)
+            async with pool.lease(
+                "192.168.1.1", username="admin", password="pw"
+            ) as busy:
+                fresh = await _lease_once(pool)
+
+                # Check the busy connection was replaced but left open
+                assert fresh is not busy
+                busy.close.assert_not_called()
+
+            # Check it was closed once its lease ended
+            busy.close.assert_called_once()
+
+            await pool.close()
+
+    async def test_reaper_does_not_spin_with_zero_timeouts(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.return_value = _mock_conn()
+
+            pool = SSHConnectionPool(idle_timeout=0, max_age=0)
+            with patch.object(
+                pool, "_is_usable", wraps=pool._is_usable
+            ) as mock_is_usable:
+                async with pool.lease("192.168.1.1", username="admin"):
+                    mock_is_usable.reset_mock()
+                    await asyncio.sleep(0.05)
+
+                # Check the reaper did not run a pass on every loop iteration
+                mock_is_usable.assert_not_called()
+
+            await pool.close()
+
+    async def test_max_size_evicts_least_recently_used(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.side_effect = lambda *args, **kwargs: _mock_conn()
+
+            pool = SSHConnectionPool(max_size=1)
+            first = await _lease_once(pool, host="192.168.1.1")
+            await _lease_once(pool, host="192.168.1.2")
+
+            # Check the older connection made room for the new one
+            first.close.assert_called_once()
+            assert len(pool) == 1
+
+            await pool.close()
+
+    async def test_discard_and_close(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.side_effect = lambda *args, **kwargs: _mock_conn()
+
+            pool = SSHConnectionPool()
+            broken = await _lease_once(pool, host="192.168.1.1")
+            healthy = await _lease_once(pool, host="192.168.1.2")
+
+            # Check a discarded connection is closed and forgotten
+            pool.discard(broken)
+            broken.close.assert_called_once()
+            assert len(pool) == 1
+
+            # Check closing the pool closes the remaining connections
+            await pool.close()
+            healthy.close.assert_called_once()
+            healthy.wait_closed.assert_awaited_once()
+            assert len(pool) == 0
+
+    async def test_discard_waits_for_other_leases(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.side_effect = lambda *args, **kwargs: _mock_conn()
+
+            pool = SSHConnectionPool()
+            async with pool.lease("192.168.1.1", username="admin") as shared:
+                async with pool.lease("192.168.1.1", username="admin") as conn:
+                    assert conn is shared
+                    pool.discard(conn)
+
+                # Check the connection left the pool but stayed open for the
+                # caller still using it
+                assert len(pool) == 0
+                shared.close.assert_not_called()
+
+            shared.close.assert_called_once()
+
+            await pool.close()
+
+    async def test_locks_are_pruned(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            mock_connect.side_effect = OSError("Connection refused")
+
+            pool = SSHConnectionPool()
+            with pytest.raises(OSError):
+                await _lease_once(pool)
+
+            # Check a failed connect leaves no lock holding the credentials
+            assert not pool._locks
+
+            mock_connect.side_effect = lambda *args, **kwargs: _mock_conn()
+            conn = await _lease_once(pool)
+            pool.discard(conn)
+
+            # Check a discarded connection's lock is dropped with it
+            assert not pool._locks
+
+            await pool.close()
+
+    async def test_close_does_not_wait_forever(self):
+        with patch(CONNECT, new=AsyncMock()) as mock_connect:
+            stuck = _mock_conn()
+            stuck.wait_closed = AsyncMock(side_effect=asyncio.Event().wait)
+            mock_connect.return_value = stuck
+
+            pool = SSHConnectionPool(close_timeout=0.01)
+            await _lease_once(pool)
+
+            # Check a connection that never finishes closing is given up on
+            await pool.close()
+            stuck.close.assert_called_once()
+            assert len(pool) == 0